@@ -6,56 +6,39 @@ Tests the full integration between frontend and backend
 
 import asyncio
 import json
+import os
+from pathlib import Path
 import websockets
 import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as ReqConnError, RequestException
 import time
 import sys
 from datetime import datetime, timedelta
 
+# Parse responses with orjson when it is installed; fall back to the stdlib
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 API_BASE_URL = "http://localhost:8000"
 WEBSOCKET_URL = "ws://localhost:8000/ws/auction-updates/"
+# (connect, read) so a server that is down fails fast instead of after the full read timeout
+HTTP_TIMEOUT = (0.5, 5)
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Shared session so every probe reuses the same keep-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
 
 def print_section(title):
-    print(f"\n{'='*60}")
-    print(f" {title}")
-    print(f"{'='*60}")
+    rule = "=" * 60
+    sys.stdout.write(f"\n{rule}\n {title}\n{rule}\n")
 
 def print_test(test_name, success, message=""):
     status = "✅ PASS" if success else "❌ FAIL"
-    print(f"{status} {test_name}")
-    if message:
-        print(f"     {message}")
-
-async def test_websocket_connection():
-    """Test WebSocket connection and basic functionality"""
-    print_section("TESTING WEBSOCKET CONNECTION")
-    
-    try:
-        async with websockets.connect(WEBSOCKET_URL) as websocket:
-            print_test("WebSocket Connection", True, "Connected successfully")
-            
-            # Test sending a message
-            test_message = {
-                "type": "test",
-                "message": "Hello from integration test"
-            }
-            
-            await websocket.send(json.dumps(test_message))
-            print_test("WebSocket Send", True, "Message sent successfully")
-            
-            # Wait for response
-            try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                response_data = json.loads(response)
-                print_test("WebSocket Receive", True, f"Received: {response_data}")
-            except asyncio.TimeoutError:
-                print_test("WebSocket Receive", False, "No response received")
-            
-            return True
-            
-    except Exception as e:
-        print_test("WebSocket Connection", False, f"Error: {e}")
-        return False
+    sys.stdout.write(f"{status} {test_name}\n" + (f"     {message}\n" if message else ""))
 
 def test_api_endpoints():
     """Test all auction API endpoints"""
@@ -63,9 +46,9 @@ def test_api_endpoints():
     
     # Test getting auctions
     try:
-        response = requests.get(f"{API_BASE_URL}/bounties/auctions/")
+        response = SESSION.get(f"{API_BASE_URL}/bounties/auctions/", timeout=HTTP_TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             print_test("GET /bounties/auctions/", True, f"Found {data.get('count', 0)} auctions")
         else:
             print_test("GET /bounties/auctions/", False, f"Status: {response.status_code}")
@@ -75,8 +58,9 @@ def test_api_endpoints():
     # Test creating an auction (if we have auth)
     try:
         # This would require authentication, so we'll just test the endpoint exists
-        response = requests.post(f"{API_BASE_URL}/bounties/auctions/create/", 
-                               json={"title": "Test", "description": "Test"})
+        response = SESSION.post(f"{API_BASE_URL}/bounties/auctions/create/", 
+                              json={"title": "Test", "description": "Test"},
+                              timeout=HTTP_TIMEOUT)
         if response.status_code in [401, 403]:  # Expected without auth
             print_test("POST /bounties/auctions/create/", True, "Endpoint exists (auth required)")
         else:
@@ -88,8 +72,6 @@ def test_frontend_files():
     """Test that frontend files exist and are properly structured"""
     print_section("TESTING FRONTEND FILES")
     
-    import os
-    
     frontend_files = [
         "src/services/api.ts",
         "src/hooks/useWebSocket.ts", 
@@ -97,70 +79,118 @@ def test_frontend_files():
         "src/pages/AuctionPage.tsx"
     ]
     
+    # Read each parent directory once instead of stat-ing every file
+    present = {}
     for file_path in frontend_files:
-        full_path = f"/Users/dera/Documents/GitHub/PlayMarket-updated/{file_path}"
-        if os.path.exists(full_path):
+        rel = Path(file_path)
+        if rel.parent not in present:
+            try:
+                with os.scandir(PROJECT_ROOT / rel.parent) as entries:
+                    present[rel.parent] = {entry.name for entry in entries if entry.is_file()}
+            except OSError:
+                present[rel.parent] = set()
+        
+        if rel.name in present[rel.parent]:
             print_test(f"File exists: {file_path}", True)
         else:
             print_test(f"File exists: {file_path}", False, "File not found")
 
-async def test_real_time_updates():
-    """Test real-time auction updates via WebSocket"""
-    print_section("TESTING REAL-TIME UPDATES")
+async def test_websocket_messages(websocket):
+    """Test WebSocket messaging and real-time auction updates"""
+    print_section("TESTING WEBSOCKET MESSAGES")
+    print_test("WebSocket Connection", True, "Connected successfully")
+    
+    # Messages go out as text frames, which is what the frontend sends
+    test_message = {
+        "type": "test",
+        "message": "Hello from integration test"
+    }
     
     try:
-        async with websockets.connect(WEBSOCKET_URL) as websocket:
-            # Send a test bid update message
-            bid_update = {
-                "type": "new_bid",
-                "auction_id": 1,
-                "amount": 150,
-                "user": "test_user"
-            }
-            
-            await websocket.send(json.dumps(bid_update))
-            print_test("Send bid update", True, "Bid update sent")
-            
-            # Wait for any response
-            try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=3.0)
-                print_test("Receive bid update", True, f"Response: {response}")
-            except asyncio.TimeoutError:
-                print_test("Receive bid update", False, "No response received")
-                
+        await websocket.send(json.dumps(test_message))
+        print_test("WebSocket Send", True, "Message sent successfully")
+    except Exception as e:
+        print_test("WebSocket Send", False, f"Error: {e}")
+        return False
+    
+    # Read each reply before the next send so it is credited to the right message
+    try:
+        async with asyncio.timeout(5.0):
+            response = await websocket.recv()
+        print_test("WebSocket Receive", True, f"Received: {json_loads(response)}")
+    except asyncio.TimeoutError:
+        print_test("WebSocket Receive", False, "No response received")
+    except Exception as e:
+        print_test("WebSocket Receive", False, f"Error: {e}")
+    
+    # Send a test bid update message
+    bid_update = {
+        "type": "new_bid",
+        "auction_id": 1,
+        "amount": 150,
+        "user": "test_user"
+    }
+    
+    try:
+        await websocket.send(json.dumps(bid_update))
+        print_test("Send bid update", True, "Bid update sent")
+    except Exception as e:
+        print_test("Send bid update", False, f"Error: {e}")
+        return False
+    
+    try:
+        async with asyncio.timeout(3.0):
+            response = await websocket.recv()
+        print_test("Receive bid update", True, f"Response: {response}")
+    except asyncio.TimeoutError:
+        print_test("Receive bid update", False, "No response received")
+        return False
     except Exception as e:
-        print_test("Real-time updates", False, f"Error: {e}")
+        print_test("Receive bid update", False, f"Error: {e}")
+        return False
+    
+    return True
+
+async def test_ws_alive(websocket):
+    """Test that the Daphne server still answers on the shared WebSocket connection"""
+    print_section("TESTING WEBSOCKET SERVER")
+    
+    try:
+        async with asyncio.timeout(5.0):
+            pong_waiter = await websocket.ping()
+            await pong_waiter
+        print_test("Daphne Server", True, "WebSocket server is running")
+    except asyncio.TimeoutError:
+        print_test("Daphne Server", False, "WebSocket server not responding")
+    except Exception as e:
+        print_test("Daphne Server", False, f"Error: {e}")
+
+async def run_ws_test(test, websocket, test_name, timeout=15.0):
+    """Run a WebSocket test with an overall timeout as a backstop
+
+    Each reply is timed and reported inside the test itself; this only
+    catches a test that hangs somewhere else.
+    """
+    try:
+        await asyncio.wait_for(test(websocket), timeout=timeout)
+    except asyncio.TimeoutError:
+        print_test(test_name, False, "Test did not finish in time")
 
 def test_system_readiness():
-    """Test overall system readiness"""
+    """Test that the Django server is running"""
     print_section("TESTING SYSTEM READINESS")
     
     # Check if Django server is running
     try:
-        response = requests.get(f"{API_BASE_URL}/", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/", timeout=HTTP_TIMEOUT)
         if response.status_code == 200:
             print_test("Django Server", True, "Server is running")
         else:
             print_test("Django Server", False, f"Unexpected status: {response.status_code}")
-    except requests.exceptions.ConnectionError:
+    except ReqConnError:
         print_test("Django Server", False, "Server not running")
     except Exception as e:
         print_test("Django Server", False, f"Error: {e}")
-    
-    # Check if Daphne server is running (WebSocket)
-    try:
-        async def check_websocket():
-            async with websockets.connect(WEBSOCKET_URL, timeout=5):
-                return True
-        
-        result = asyncio.run(check_websocket())
-        if result:
-            print_test("Daphne Server", True, "WebSocket server is running")
-        else:
-            print_test("Daphne Server", False, "WebSocket server not responding")
-            
-    except Exception as e:
-        print_test("Daphne Server", False, f"Error: {e}")
 
 async def main():
     """Run all integration tests"""
@@ -169,13 +199,34 @@ async def main():
     print(f"API Base URL: {API_BASE_URL}")
     print(f"WebSocket URL: {WEBSOCKET_URL}")
     
+    # Open a pooled connection up front so the probes below only measure steady-state cost
+    try:
+        SESSION.get(f"{API_BASE_URL}/", timeout=HTTP_TIMEOUT)
+    except RequestException:
+        pass
+    
     # Run all tests
-    await test_websocket_connection()
     test_api_endpoints()
     test_frontend_files()
-    await test_real_time_updates()
     test_system_readiness()
     
+    # Share one WebSocket connection across the WebSocket tests
+    try:
+        async with websockets.connect(
+            WEBSOCKET_URL,
+            open_timeout=5,
+            compression=None,
+            max_queue=1024,
+            max_size=2**22,
+            ping_interval=None,
+        ) as websocket:
+            await run_ws_test(test_websocket_messages, websocket, "WebSocket Messages")
+            await run_ws_test(test_ws_alive, websocket, "Daphne Server")
+    except Exception as e:
+        print_section("TESTING WEBSOCKET MESSAGES")
+        print_test("WebSocket Connection", False, f"Error: {e}")
+        print_test("Daphne Server", False, "WebSocket server not responding")
+    
     print_section("INTEGRATION TEST COMPLETE")
     print("If all tests passed, the auction system is ready for use!")
     print("\nTo start using the auction system:")
@@ -185,4 +236,10 @@ async def main():
     print("4. The RealAuctionPage component will handle the rest!")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # A single event loop runs every test; use uvloop when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file